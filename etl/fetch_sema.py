@@ -14,33 +14,106 @@ Observações:
 """
 
 import argparse
+import csv
+import hashlib
+import io
 import json
 import os
 import re
+import ssl
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
-import unicodedata
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache, partial
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer, UnicodeDammit
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import traceback
 
+try:
+    import pypdfium2 as pdfium  # type: ignore
+except ImportError:  # pragma: no cover - opcional
+    pdfium = None
+
 try:
     import pdfplumber  # type: ignore
 except Exception:  # pragma: no cover - opcional
     pdfplumber = None
 
+try:
+    import httpx  # type: ignore
+except ImportError:  # pragma: no cover - opcional
+    httpx = None
+
+# Falhas de rede de qualquer um dos clientes HTTP
+NET_ERRORS = (requests.RequestException,) + ((httpx.HTTPError,) if httpx is not None else ())
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - opcional
+    orjson = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser  # type: ignore
+except ImportError:  # pragma: no cover - opcional
+    LexborHTMLParser = None
+
+try:
+    import lxml  # type: ignore  # noqa: F401
+    HTML_PARSER = 'lxml'
+except Exception:  # pragma: no cover - opcional
+    HTML_PARSER = 'html.parser'
+
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 DATA_DIR = os.path.join(ROOT, 'data')
 RAW_DIR = os.path.join(DATA_DIR, 'raw')
+CACHE_DIR = os.path.join(RAW_DIR, '.cache')
+# ETag/Last-Modified de cada PDF baixado, para requisições condicionais
+META_DIR = os.path.join(RAW_DIR, '.meta')
 GEOCODES_CSV = os.path.join(DATA_DIR, 'stations_geocoded.csv')
 POINTS_JSON = os.path.join(DATA_DIR, 'points.json')
 
 LAUDOS_URL = 'https://sema.ma.gov.br/laudos-de-balneabilidade'
 PDF_BASE_URL = 'https://sema.ma.gov.br/uploads/sema/docs/'
 
+# Downloads simultâneos de PDFs (mesmo host)
+DOWNLOAD_WORKERS = 8
+# Conexões mantidas por host; folga sobre DOWNLOAD_WORKERS para índice/páginas
+POOL_SIZE = 16
+# Blocos maiores = menos iterações em Python e escritas sequenciais maiores
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# Sessão compartilhada: mantém cookies e reaproveita conexões (keep-alive),
+# evitando novo handshake TCP+TLS a cada requisição
+SESSION = requests.Session()
+# O adapter repete uma única vez, na hora, uma falha ao abrir a conexão (ex.: conexão
+# keep-alive descartada pelo servidor); leitura, status e SSL (other=0) não são
+# repetidos aqui, para o SSLError chegar logo ao fallback verify=False e as
+# retentativas com backoff ficarem só nos laços explícitos de cada função
+_ADAPTER = HTTPAdapter(
+    pool_connections=POOL_SIZE,
+    pool_maxsize=POOL_SIZE,
+    max_retries=Retry(total=1, connect=1, read=0, status=0, other=0, backoff_factor=0),
+)
+SESSION.mount('https://', _ADAPTER)
+SESSION.mount('http://', _ADAPTER)
+SESSION.headers.update({'Connection': 'keep-alive'})
+
+
+# Restringe a árvore do BeautifulSoup às âncoras com href
+ANCHOR_STRAINER = SoupStrainer('a', href=True)
+
+# Palavras-chave que indicam um link de laudo no texto/contexto da âncora
+_LAUDO_KEYWORD_RE = re.compile(r'laudo|balneabilidade', re.IGNORECASE)
+# dd[_-./]mm[_-./]yyyy em textos/URLs
+_ANY_DATE_RE = re.compile(r'(\d{1,2})[_.\-/](\d{1,2})[_.\-/](\d{2,4})')
+# Caracteres não permitidos no nome local do PDF
+_UNSAFE_NAME_RE = re.compile(r'[^A-Za-z0-9._-]+')
+
 
 def _insecure_ssl() -> bool:
     # Permite contornar ambientes sem cadeia de certificados correta
@@ -49,19 +122,14 @@ def _insecure_ssl() -> bool:
     return env in ('1', 'true', 'TRUE', 'yes', 'on')
 
 
-@dataclass
-class Sample:
-    date: str
-    status: str
-
-
-@dataclass
+@dataclass(slots=True)
 class Station:
     code: str
     beach: Optional[str] = None
     reference: Optional[str] = None
     city: Optional[str] = None
-    history: List[Sample] = field(default_factory=list)
+    # Histórico como conjunto de (data ISO, status): repetições do mesmo laudo não acumulam
+    history: Set[Tuple[str, str]] = field(default_factory=set)
     source_laudo: Optional[str] = None
     lat: Optional[float] = None
     lng: Optional[float] = None
@@ -78,8 +146,7 @@ def _parse_date_any(s: str) -> Optional[datetime]:
     """
     if not s:
         return None
-    # dd[_-./]mm[_-./]yyyy
-    m = re.search(r'(\d{1,2})[_.\-/](\d{1,2})[_.\-/](\d{2,4})', s)
+    m = _ANY_DATE_RE.search(s)
     if m:
         d, mth, y = m.groups()
         try:
@@ -198,7 +265,75 @@ def generate_recent_pdf_urls(weeks_back: int = 8) -> List[Dict[str, str]]:
     return unique_urls
 
 
-def fetch_laudo_index(limit: int = 5, timeout: int = 30, insecure: bool = False, max_retries: int = 3) -> List[Dict[str, str]]:
+def _declared_charset(r: requests.Response) -> bool:
+    # Sem charset no Content-Type o requests assume ISO-8859-1 para text/*, o que
+    # anularia o <meta charset> da página; nesse caso o encoding é detectado nos bytes
+    return 'charset' in (r.headers.get('content-type') or '').lower()
+
+
+def _make_soup(r: requests.Response, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """Monta o BeautifulSoup a partir dos bytes da resposta."""
+    return BeautifulSoup(r.content, HTML_PARSER, parse_only=parse_only, from_encoding=r.encoding if _declared_charset(r) else None)
+
+
+def _decode_html(r: requests.Response) -> str:
+    """Texto da página com a mesma regra de encoding do _make_soup (para o Lexbor)."""
+    if _declared_charset(r):
+        return r.text
+    # Mesma detecção do BeautifulSoup: <meta charset>, BOM, UTF-8 e afins
+    return UnicodeDammit(r.content, is_html=True).unicode_markup or r.text
+
+
+def _node_text(node) -> str:
+    # Equivalente ao get_text(" ", strip=True) do BeautifulSoup
+    return ' '.join(node.text(separator=' ').split())
+
+
+def _lexbor_ancestor_texts(node) -> List[str]:
+    ctx: List[str] = []
+    parent = node.parent
+    if parent is not None:
+        ctx.append(_node_text(parent))
+        gp = parent.parent
+        if gp is not None:
+            ctx.append(_node_text(gp))
+    return ctx
+
+
+def _soup_ancestor_texts(a) -> List[str]:
+    ctx: List[str] = []
+    try:
+        parent = a.parent
+        if parent is not None:
+            ctx.append(parent.get_text(" ", strip=True) or '')
+            gp = getattr(parent, 'parent', None)
+            if gp is not None and hasattr(gp, 'get_text'):
+                ctx.append(gp.get_text(" ", strip=True) or '')
+    except Exception:
+        pass
+    return ctx
+
+
+def _iter_anchors(r: requests.Response, with_context: bool = False) -> Iterator[Tuple[str, str, Callable[[], List[str]]]]:
+    """Itera (href, texto, ancestors) das âncoras com href da página.
+
+    Usa selectolax (Lexbor, em C) quando instalado; senão BeautifulSoup.
+    ancestors() devolve os textos do pai e do avô sob demanda: montar esse
+    texto é o passo caro e a maioria das âncoras é descartada antes. Com
+    with_context=False a árvore do BeautifulSoup contém só as âncoras.
+    """
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(_decode_html(r))
+        for node in tree.css('a[href]'):
+            yield node.attributes.get('href') or '', _node_text(node), partial(_lexbor_ancestor_texts, node)
+        return
+
+    soup = _make_soup(r, parse_only=None if with_context else ANCHOR_STRAINER)
+    for a in soup.find_all('a', href=True):
+        yield a['href'] or '', a.get_text(" ", strip=True) or '', partial(_soup_ancestor_texts, a)
+
+
+def fetch_laudo_index(limit: int = 5, timeout: int = 30, insecure: bool = False, max_retries: int = 3, session: Optional[requests.Session] = None) -> List[Dict[str, str]]:
     """Coleta os últimos itens de laudos do site e retorna [{title, url}]."""
     # Headers mais realistas para contornar proteção anti-bot
     headers = {
@@ -216,11 +351,12 @@ def fetch_laudo_index(limit: int = 5, timeout: int = 30, insecure: bool = False,
         'DNT': '1'
     }
 
-    # Cria uma sessão para manter cookies
-    session = requests.Session()
-    session.headers.update(headers)
+    session = session or SESSION
+    # Falha de SSL desliga a verificação e repete na hora, sem gastar tentativa
+    verify = not insecure
 
-    for attempt in range(max_retries):
+    attempt = 0
+    while attempt < max_retries:
         try:
             # Pequeno delay antes de cada tentativa para parecer mais humano
             if attempt > 0:
@@ -230,9 +366,8 @@ def fetch_laudo_index(limit: int = 5, timeout: int = 30, insecure: bool = False,
             current_timeout = timeout * (attempt + 1)
             request_timeout = (8, current_timeout)
 
-            r = session.get(LAUDOS_URL, timeout=request_timeout, verify=not insecure, allow_redirects=True)
+            r = session.get(LAUDOS_URL, headers=headers, timeout=request_timeout, verify=verify, allow_redirects=True)
             r.raise_for_status()
-            soup = BeautifulSoup(r.text, 'html.parser')
             break
         except requests.exceptions.Timeout as e:
             print(f'WARN: timeout ao acessar índice de laudos em {LAUDOS_URL} (tentativa {attempt + 1}/{max_retries}): {e}')
@@ -241,9 +376,10 @@ def fetch_laudo_index(limit: int = 5, timeout: int = 30, insecure: bool = False,
                 return []
             time.sleep(_calc_delay(attempt))
         except requests.exceptions.SSLError as e:
-            if not insecure:
+            if verify:
                 print('WARN: SSL inválido no índice da SEMA; tentando novamente sem verificação (confie antes de usar).')
-                return fetch_laudo_index(limit=limit, timeout=timeout, insecure=True, max_retries=max_retries)
+                verify = False
+                continue
             print(f'WARN: falha ao acessar índice de laudos em {LAUDOS_URL}: {e}')
             if attempt == max_retries - 1:
                 print(f'ERROR: Falha final após {max_retries} tentativas. Verifique conectividade com {LAUDOS_URL}')
@@ -255,52 +391,39 @@ def fetch_laudo_index(limit: int = 5, timeout: int = 30, insecure: bool = False,
                 print(f'ERROR: Falha final após {max_retries} tentativas. Verifique conectividade com {LAUDOS_URL}')
                 return []
             time.sleep(_calc_delay(attempt))
+        attempt += 1
     else:
         return []
 
-    items: List[Dict[str, str]] = []
+    # Uma única passada: filtra, deduplica por URL (mantendo a ordem) e data cada link
+    seen = set()
+    unique: List[Dict[str, str]] = []
     # Heurística: buscar links para PDF ou páginas cujo contexto cite Laudo/Balneabilidade
-    for a in soup.find_all('a', href=True):
-        href = a['href'] or ''
+    # Coleta um pouco de contexto (pai imediato e avô) para achar datas/palavras-chave
+    for href, text, ancestors in _iter_anchors(r, with_context=True):
         if not href:
             continue
-        text = a.get_text(" ", strip=True) or ''
-        # Coleta um pouco de contexto (pai imediato e avô) para achar datas/palavras-chave
-        ctx_parts: List[str] = [text]
-        try:
-            parent = a.parent
-            if parent is not None:
-                ctx_parts.append(parent.get_text(" ", strip=True) or '')
-                gp = getattr(parent, 'parent', None)
-                if gp is not None and hasattr(gp, 'get_text'):
-                    ctx_parts.append(gp.get_text(" ", strip=True) or '')
-        except Exception:
-            pass
-        context_text = ' '.join([p for p in ctx_parts if p])
-
         href_abs = href if href.startswith('http') else requests.compat.urljoin(LAUDOS_URL, href)
-        h = href.lower()
-        t = (text or '').lower()
-        c = (context_text or '').lower()
-
-        looks_pdf = h.endswith('.pdf')
-        mentions_laudo = ('laudo' in t) or ('balneabilidade' in t) or ('laudo' in c) or ('balneabilidade' in c)
+        if href_abs in seen:
+            continue
 
-        if looks_pdf or mentions_laudo:
-            # extrai data de href, texto ou contexto (ex.: "período de ... a 15/09/2025")
-            dt = _parse_date_any(href) or _parse_date_any(text) or _parse_date_any(context_text)
-            ts = _safe_timestamp(dt)
-            items.append({'title': text, 'url': href_abs, 'ts': ts})
+        # Filtros baratos primeiro: o contexto (pai/avô) só é montado se necessário
+        context_text: Optional[str] = None
+        looks_pdf = href.lower().endswith('.pdf')
+        if not looks_pdf and _LAUDO_KEYWORD_RE.search(text) is None:
+            context_text = ' '.join([p for p in [text] + ancestors() if p])
+            if _LAUDO_KEYWORD_RE.search(context_text) is None:
+                continue
 
-    # Remover duplicados conservando ordem
-    seen = set()
-    unique = []
-    for it in items:
-        key = it['url']
-        if key in seen:
-            continue
-        seen.add(key)
-        unique.append(it)
+        # extrai data de href, texto ou contexto (ex.: "período de ... a 15/09/2025")
+        dt = _parse_date_any(href) or _parse_date_any(text)
+        if dt is None:
+            if context_text is None:
+                context_text = ' '.join([p for p in [text] + ancestors() if p])
+            dt = _parse_date_any(context_text)
+        ts = _safe_timestamp(dt)
+        seen.add(href_abs)
+        unique.append({'title': text, 'url': href_abs, 'ts': ts})
 
     # Ordena: prioriza PDFs e com data mais recente (ts maior)
     def sort_key(x: Dict[str, str]):
@@ -320,14 +443,135 @@ def fetch_laudo_index(limit: int = 5, timeout: int = 30, insecure: bool = False,
     return top
 
 
-def download_pdf(url: str, timeout: int = 120, force: bool = False, insecure: bool = False, max_retries: int = 3) -> str:
-    """Baixa um PDF para data/raw e devolve o caminho local."""
-    name = re.sub(r'[^A-Za-z0-9._-]+', '_', os.path.basename(url))
+def make_http2_client(insecure: bool = False):
+    """Cria um httpx.Client com HTTP/2 (todos os PDFs numa única conexão TLS).
+
+    Devolve None quando httpx/h2 não estão instalados; nesse caso os downloads
+    seguem pelo SESSION (HTTP/1.1 com keep-alive).
+    """
+    if httpx is None:
+        print('WARN: httpx não instalado; downloads seguem via HTTP/1.1 (pip install "httpx[http2]").')
+        return None
+    try:
+        return httpx.Client(http2=True, verify=not insecure, follow_redirects=True)
+    except ImportError:
+        print('WARN: pacote h2 ausente; downloads seguem via HTTP/1.1 (pip install "httpx[http2]").')
+        return None
+
+
+def _meta_path(path: str) -> str:
+    return os.path.join(META_DIR, os.path.basename(path) + '.json')
+
+
+def _conditional_headers(path: str) -> Dict[str, str]:
+    """If-None-Match/If-Modified-Since a partir dos validadores salvos do PDF local."""
+    try:
+        with open(_meta_path(path), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    headers: Dict[str, str] = {}
+    if meta.get('etag'):
+        headers['If-None-Match'] = meta['etag']
+    if meta.get('last_modified'):
+        headers['If-Modified-Since'] = meta['last_modified']
+    return headers
+
+
+def _save_validators(path: str, resp_headers) -> None:
+    meta = {'etag': resp_headers.get('ETag') or '', 'last_modified': resp_headers.get('Last-Modified') or ''}
+    meta_path = _meta_path(path)
+    if not (meta['etag'] or meta['last_modified']):
+        # Servidor sem validadores: descarta metadados antigos
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        return
+    os.makedirs(META_DIR, exist_ok=True)
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+
+
+def _store_pdf(path: str, chunks, resp_headers) -> None:
+    """Grava o corpo em <path>.part e só então substitui o PDF e os validadores.
+
+    Uma transferência interrompida nunca deixa um PDF truncado ao lado de
+    ETag/Last-Modified que o servidor confirmaria com 304 depois.
+    """
+    part = path + '.part'
+    try:
+        with open(part, 'wb') as f:
+            for chunk in chunks:
+                if chunk:
+                    f.write(chunk)
+        os.replace(part, path)
+    except BaseException:
+        if os.path.exists(part):
+            os.remove(part)
+        raise
+    _save_validators(path, resp_headers)
+
+
+def _is_cert_error(exc: BaseException) -> bool:
+    """Verdadeiro se a falha vem da verificação TLS (httpx a embrulha em ConnectError)."""
+    while exc is not None:
+        if isinstance(exc, ssl.SSLError) or 'CERTIFICATE_VERIFY_FAILED' in str(exc):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+def _download_pdf_http2(client, url: str, path: str, headers: Dict[str, str], timeout: int = 120, max_retries: int = 3) -> str:
+    """Variante de download_pdf sobre um httpx.Client com HTTP/2."""
+    for attempt in range(max_retries):
+        try:
+            if attempt > 0:
+                time.sleep(_calc_delay(attempt))
+            # Aumenta timeout progressivamente
+            request_timeout = httpx.Timeout(timeout + (attempt * 30), connect=10)
+            with client.stream('GET', url, headers=headers, timeout=request_timeout) as r:
+                if r.status_code == 404:
+                    print(f'INFO: PDF não encontrado (404): {url}')
+                    return ''
+                if r.status_code == 304:
+                    print(f'INFO: PDF inalterado (304): {os.path.basename(path)}')
+                    return path
+                r.raise_for_status()
+                _store_pdf(path, r.iter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE), r.headers)
+            print(f'SUCCESS: PDF baixado: {os.path.basename(path)}')
+            return path
+        except httpx.HTTPError as e:
+            if _is_cert_error(e):
+                # Sem gastar tentativas: download_pdf repete pelo SESSION
+                raise
+            print(f'WARN: falha ao baixar {url} via HTTP/2 (tentativa {attempt + 1}/{max_retries}): {e}')
+            if attempt == max_retries - 1:
+                raise
+    return path
+
+
+def local_pdf_path(url: str) -> str:
+    """Caminho em data/raw/ onde o PDF da URL é salvo (só o nome do arquivo conta)."""
+    name = _UNSAFE_NAME_RE.sub('_', os.path.basename(url))
     if not name.lower().endswith('.pdf'):
         name += '.pdf'
-    path = os.path.join(RAW_DIR, name)
+    return os.path.join(RAW_DIR, name)
+
+
+def download_pdf(url: str, timeout: int = 120, force: bool = False, insecure: bool = False, max_retries: int = 3, session: Optional[requests.Session] = None, client=None) -> str:
+    """Baixa um PDF para data/raw e devolve o caminho local.
+
+    Com `client` (ver make_http2_client) o download usa HTTP/2 via httpx.
+    """
+    path = local_pdf_path(url)
+    # Com ETag/Last-Modified salvos, revalida em vez de confiar só no arquivo
+    # local (detecta PDF atualizado na mesma URL; 304 não transfere o corpo).
+    # force (--refresh-raw) baixa de novo sem requisição condicional, o que
+    # também recupera uma cópia local corrompida
+    validators: Dict[str, str] = {}
     if not force and os.path.exists(path) and os.path.getsize(path) > 0:
-        return path
+        validators = _conditional_headers(path)
+        if not validators:
+            return path
 
     # Headers realistas para download
     headers = {
@@ -339,12 +583,42 @@ def download_pdf(url: str, timeout: int = 120, force: bool = False, insecure: bo
         'Referer': LAUDOS_URL,
         'DNT': '1'
     }
+    headers.update(validators)
 
-    # Cria uma sessão
-    session = requests.Session()
-    session.headers.update(headers)
+    try:
+        if client is not None:
+            # HTTP/2 proíbe cabeçalhos de conexão; a compressão é negociada pelo httpx
+            h2_headers = {k: v for k, v in headers.items() if k not in ('Connection', 'Accept-Encoding')}
+            try:
+                result = _download_pdf_http2(client, url, path, h2_headers, timeout=timeout, max_retries=max_retries)
+            except httpx.HTTPError as e:
+                if not _is_cert_error(e):
+                    raise
+                # O client compartilhado verifica o certificado; esta URL segue pelo
+                # SESSION, que desliga a verificação só para ela
+                print(f'WARN: SSL inválido via HTTP/2 em {url}; repetindo via HTTP/1.1.')
+                result = _download_pdf_session(session or SESSION, url, path, headers, timeout=timeout, insecure=insecure, max_retries=max_retries)
+        else:
+            result = _download_pdf_session(session or SESSION, url, path, headers, timeout=timeout, insecure=insecure, max_retries=max_retries)
+    except NET_ERRORS as e:
+        if not validators:
+            raise
+        # Só a revalidação falhou: a cópia local continua válida
+        print(f'WARN: revalidação de {url} falhou; mantendo cópia local: {e}')
+        return path
+    if not result and validators:
+        print(f'WARN: PDF sumiu do servidor; mantendo cópia local: {os.path.basename(path)}')
+        return path
+    return result
 
-    for attempt in range(max_retries):
+
+def _download_pdf_session(session: requests.Session, url: str, path: str, headers: Dict[str, str], timeout: int = 120, insecure: bool = False, max_retries: int = 3) -> str:
+    """Variante de download_pdf sobre um requests.Session (HTTP/1.1)."""
+    # Falha de SSL desliga a verificação e repete na hora, sem gastar tentativa
+    verify = not insecure
+
+    attempt = 0
+    while attempt < max_retries:
         try:
             # Pequeno delay antes de cada tentativa
             if attempt > 0:
@@ -354,16 +628,16 @@ def download_pdf(url: str, timeout: int = 120, force: bool = False, insecure: bo
             current_timeout = timeout + (attempt * 30)
             request_timeout = (10, current_timeout)
 
-            with session.get(url, timeout=request_timeout, stream=True, verify=not insecure, allow_redirects=True) as r:
+            with session.get(url, headers=headers, timeout=request_timeout, stream=True, verify=verify, allow_redirects=True) as r:
                 # Se for 404, não vale a pena tentar novamente
                 if r.status_code == 404:
                     print(f'INFO: PDF não encontrado (404): {url}')
                     return ''  # Retorna string vazia para indicar que o PDF não existe
+                if r.status_code == 304:
+                    print(f'INFO: PDF inalterado (304): {os.path.basename(path)}')
+                    return path
                 r.raise_for_status()
-                with open(path, 'wb') as f:
-                    for chunk in r.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
+                _store_pdf(path, r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE), r.headers)
             print(f'SUCCESS: PDF baixado: {os.path.basename(path)}')
             return path
         except requests.exceptions.Timeout as e:
@@ -372,9 +646,10 @@ def download_pdf(url: str, timeout: int = 120, force: bool = False, insecure: bo
                 raise
             time.sleep(_calc_delay(attempt))
         except requests.exceptions.SSLError as e:
-            if not insecure:
+            if verify:
                 print(f'WARN: SSL inválido ao baixar {url}; nova tentativa sem verificação (confira a procedência).')
-                return download_pdf(url, timeout=timeout, force=force, insecure=True, max_retries=max_retries)
+                verify = False
+                continue
             print(f'WARN: falha SSL ao baixar {url} (tentativa {attempt + 1}/{max_retries}): {e}')
             if attempt == max_retries - 1:
                 raise
@@ -385,10 +660,11 @@ def download_pdf(url: str, timeout: int = 120, force: bool = False, insecure: bo
             if attempt == max_retries - 1:
                 raise
             time.sleep(_calc_delay(attempt))
+        attempt += 1
     return path
 
 
-def resolve_pdf_from_page(url: str, timeout: int = 30, insecure: bool = False) -> Optional[str]:
+def resolve_pdf_from_page(url: str, timeout: int = 30, insecure: bool = False, session: Optional[requests.Session] = None) -> Optional[str]:
     """Dado um URL de página (não-PDF), tenta encontrar um link para PDF dentro dela.
     Retorna o URL absoluto do PDF encontrado, priorizando caminhos que contenham
     'balneabilidade'. Caso não encontre, devolve None.
@@ -402,23 +678,26 @@ def resolve_pdf_from_page(url: str, timeout: int = 30, insecure: bool = False) -
         'Referer': LAUDOS_URL
     }
 
-    try:
-        r = requests.get(url, timeout=timeout, verify=not insecure, headers=headers)
-        r.raise_for_status()
-    except requests.exceptions.SSLError as e:
-        if not insecure:
-            print(f'WARN: SSL inválido na página {url}; tentando novamente sem verificação (confie antes de prosseguir).')
-            return resolve_pdf_from_page(url, timeout=timeout, insecure=True)
-        print(f'WARN: falha ao abrir página de laudo {url}: {e}')
-        return None
-    except requests.RequestException as e:
-        print(f'WARN: falha ao abrir página de laudo {url}: {e}')
-        return None
+    session = session or SESSION
+    verify = not insecure
+    while True:
+        try:
+            r = session.get(url, timeout=timeout, verify=verify, headers=headers)
+            r.raise_for_status()
+            break
+        except requests.exceptions.SSLError as e:
+            if verify:
+                print(f'WARN: SSL inválido na página {url}; tentando novamente sem verificação (confie antes de prosseguir).')
+                verify = False
+                continue
+            print(f'WARN: falha ao abrir página de laudo {url}: {e}')
+            return None
+        except requests.RequestException as e:
+            print(f'WARN: falha ao abrir página de laudo {url}: {e}')
+            return None
 
-    soup = BeautifulSoup(r.text, 'html.parser')
     cand: List[str] = []
-    for a in soup.find_all('a', href=True):
-        href = a['href'] or ''
+    for href, _, _ in _iter_anchors(r):
         if not href:
             continue
         if href.lower().endswith('.pdf'):
@@ -432,7 +711,189 @@ def resolve_pdf_from_page(url: str, timeout: int = 30, insecure: bool = False) -
     return cand[0]
 
 
-def parse_pdf_text(pdf_path: str) -> List[Dict[str, str]]:
+# Espaços/tabs repetidos numa linha; as quebras de linha são preservadas
+_H_SPACE_RE = re.compile(r'[ \t]+')
+# Páginas úteis ao parser: códigos Pxx, o período do laudo, a série histórica ou
+# qualquer rótulo/valor de ponto (continuação de tabela ou histórico sem cabeçalho)
+_PAGE_KEEP_RE = re.compile(r'P\d|per[ií]odo|s[ée]rie|status|data\s*da\s*coleta|pr[óo]prio', re.IGNORECASE)
+# Incrementar ao mudar a extração/normalização do texto (invalida o cache .txt)
+TEXT_CACHE_VERSION = 4
+
+
+def _extract_page_text(pdf_path: str, page_idx: int) -> str:
+    """Extrai o texto de uma única página (executada em processo separado)."""
+    with pdfplumber.open(pdf_path) as pdf:
+        page = pdf.pages[page_idx]
+        # Os caracteres crus saem do content stream sem a reconstrução de layout;
+        # capa, metodologia e anexos sem nada do que o parser procura são pulados
+        raw = ''.join(c['text'] for c in page.chars)
+        if not _PAGE_KEEP_RE.search(raw):
+            return ''
+        # Tenta primeiro com boa tolerância horizontal/vertical
+        text = page.extract_text(x_tolerance=1.5, y_tolerance=3) or ''
+    return _H_SPACE_RE.sub(' ', text)
+
+
+def _extract_text_pdfium(pdf_path: str) -> str:
+    """Extrai o texto bruto via PDFium, sem a análise de layout do pdfminer."""
+    pdf = pdfium.PdfDocument(pdf_path)
+    buf = io.StringIO()
+    try:
+        for i, page in enumerate(pdf):
+            textpage = page.get_textpage()
+            if i:
+                buf.write('\n')
+            # PDFium separa linhas com \r\n; normaliza para o parsing por linha
+            buf.write(_H_SPACE_RE.sub(' ', textpage.get_text_range().replace('\r\n', '\n')))
+            textpage.close()
+            page.close()
+    finally:
+        pdf.close()
+    return buf.getvalue()
+
+
+def _extract_text_pdfplumber(pdf_path: str) -> str:
+    """Extrai o texto de todas as páginas com pdfplumber, preservando a ordem.
+
+    O pdfminer é CPU-bound e as páginas são independentes, então cada página
+    é extraída em um processo do pool quando há mais de uma.
+    """
+    with pdfplumber.open(pdf_path) as pdf:
+        n_pages = len(pdf.pages)
+    workers = min(os.cpu_count() or 1, n_pages)
+    if workers <= 1:
+        text_pages = [_extract_page_text(pdf_path, i) for i in range(n_pages)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            text_pages = list(ex.map(_extract_page_text, [pdf_path] * n_pages, range(n_pages)))
+    return '\n'.join(text_pages)
+
+
+def extract_pdf_text(pdf_path: str) -> str:
+    """Extrai o texto do PDF; usa pypdfium2 quando disponível, senão pdfplumber."""
+    if pdfium is not None:
+        return _extract_text_pdfium(pdf_path)
+    return _extract_text_pdfplumber(pdf_path)
+
+
+def _file_sha1(path: str) -> str:
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _text_engine() -> str:
+    return 'pdfium' if pdfium is not None else 'pdfplumber'
+
+
+def load_pdf_text(pdf_path: str, digest: Optional[str] = None) -> str:
+    """Devolve o texto do PDF, reaproveitando o cache em data/raw/.cache/.
+
+    A chave é o hash do conteúdo (laudos antigos não mudam) e o extrator
+    usado, já que pypdfium2 e pdfplumber produzem textos ligeiramente diferentes.
+    """
+    digest = digest or _file_sha1(pdf_path)
+    cache_path = os.path.join(CACHE_DIR, f'{digest}.{_text_engine()}.t{TEXT_CACHE_VERSION}.txt')
+    if os.path.exists(cache_path):
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    text = extract_pdf_text(pdf_path)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return text
+
+
+# Remoção de acentos do português por tabela (uma chamada em C por string)
+_ACCENT_TABLE = str.maketrans('ÁÀÂÃÄáàâãäÉÈÊËéèêëÍÌÎÏíìîïÓÒÔÕÖóòôõöÚÙÛÜúùûüÇç', 'AAAAAaaaaaEEEEeeeeIIIIiiiiOOOOOoooooUUUUuuuuCc')
+
+
+def _strip_accents(txt: str) -> str:
+    return txt.translate(_ACCENT_TABLE)
+
+
+_CANONICAL_STATUSES = frozenset(('PRÓPRIO', 'IMPRÓPRIO'))
+
+# Incrementar ao mudar parse_pdf_text: invalida o cache de linhas já parseadas
+PARSER_VERSION = 4
+
+
+@lru_cache(maxsize=256)
+def _normalize_status(s: Optional[str]) -> str:
+    """Canoniza o status para PRÓPRIO/IMPRÓPRIO (DESCONHECIDO se vazio).
+
+    Os status brutos se repetem muito (poucas grafias por laudo), então o
+    resultado é memoizado e cada linha vira uma consulta ao cache.
+    """
+    raw = (s or '').upper().replace('"', '').replace("'", '').replace('`', '')
+    ascii_ = _strip_accents(raw)
+    if 'IMPROPRIO' in ascii_:
+        return 'IMPRÓPRIO'
+    if 'PROPRIO' in ascii_:
+        return 'PRÓPRIO'
+    return raw or 'DESCONHECIDO'
+
+
+# Regex do parser, compiladas uma única vez (o cache interno do re é pequeno)
+_WS_RE = re.compile(r'\s+')
+_PERIOD_RE = re.compile(r'período\s+de\s+(\d{2}/\d{2}/\d{4})\s+a\s+(\d{2}/\d{2}/\d{4})', re.IGNORECASE)
+_SPLIT_CODE_RE = re.compile(r'(P\d{1,3})')
+# Campos por linha (Heurística 1): padrões em ordem de prioridade, valor no grupo "v".
+# O primeiro padrão que casar em qualquer lugar do bloco vence (ex.: "Ponto de referência"
+# antes de "Ref."); rótulos curtos exigem fronteira de palavra e pontuação
+_PRAIA_RES = (
+    re.compile(r'^\s*Praia\b\s*:?\s*(?P<v>.+)$', re.IGNORECASE | re.MULTILINE),
+    re.compile(r'\bPraia\s*:\s*(?P<v>.+)$', re.IGNORECASE | re.MULTILINE),
+)
+_REF_RES = (
+    re.compile(r'\bPonto\s+de\s+refer(?:ê|e)ncia\b\s*:?\s*(?P<v>.+)$', re.IGNORECASE | re.MULTILINE),
+    re.compile(r'\bRefer[eê]ncia\b\s*:?\s*(?P<v>.+)$', re.IGNORECASE | re.MULTILINE),
+    re.compile(r'\bRef(?:\.|\s*:)\s*:?\s*(?P<v>.+)$', re.IGNORECASE | re.MULTILINE),
+)
+_DATA_RES = (re.compile(r'Data\s+da\s+coleta\s*:?\s*(?P<v>\d{2}/\d{2}/\d{4})', re.IGNORECASE),)
+_STATUS_RE = re.compile(r'\b(IMPR[ÓO]PRIO|PR[ÓO]PRIO|IMPROPRIO|PROPRIO|IMPRPRIO)\b', re.IGNORECASE)
+# Heurística 2: blocos no texto linear "Praia: X Ponto de referência: Y Data: Z Status: W"
+_BLOCK_PAT = re.compile(
+    r'(P\d{1,3})[^P]*?Praia:\s*(.*?)\s*(?:Ponto\s+de\s+refer(?:ê|e)ncia|Ponto\s+de\s+referencia|Refer[eê]ncia|Ref\.):\s*(.*?)\s*(?:Data\s+da\s+coleta:)?\s*(\d{2}/\d{2}/\d{4})?[^S]*?Status:\s*([A-ZÇÃÓÍÉÊÀÂÕÚ]+)',
+    re.IGNORECASE
+)
+# Heurística 2 (fallback): linhas compactas com código, praia, referência e status
+_ROW_PAT = re.compile(r'(P\d{1,3}).{0,80}?([A-Za-zÀ-ÿ\'\- ]+).{0,200}?\b(?:Ponto\s+de\s+refer(?:ê|e)ncia|Refer[eê]ncia|Ref\.)\s*:?\s*([^\n\r]+?)\s+(?:Data\s+da\s+coleta\s*:?\s*(\d{2}/\d{2}/\d{4}))?.{0,80}?\b(PR[ÓO]PRIO|IMPR[ÓO]PRIO)\b', re.IGNORECASE)
+# As duas variantes da Heurística 2 numa só alternação (bloco tem prioridade na
+# mesma posição); m.lastgroup diz qual casou e _H2_OFFSETS onde começam seus grupos
+_H2_RE = re.compile(f'(?P<block>{_BLOCK_PAT.pattern})|(?P<row>{_ROW_PAT.pattern})', re.IGNORECASE)
+_H2_OFFSETS = {'block': 1, 'row': _BLOCK_PAT.groups + 2}
+# Heurística 3: pares data-status da "Série histórica"
+_HIST_PAIR = re.compile(r'(\d{2}/\d{2}/\d{4})\s*[-–—]\s*(PR[ÓO]PRIO|IMPR[ÓO]PRIO)', re.IGNORECASE)
+_HIST_HEADER_RE = re.compile(r's[ée]rie\s+hist[óo]rica', re.IGNORECASE)
+
+
+def _find_line(pats: Tuple[re.Pattern, ...], block: str) -> Optional[str]:
+    for pat in pats:
+        m = pat.search(block)
+        if m:
+            return m.group('v').strip(' :-')
+    return None
+
+
+def _iter_code_blocks(text: str) -> Iterator[Tuple[str, str]]:
+    """Itera (código, trecho até o próximo código) por offsets do finditer.
+
+    Equivale a _SPLIT_CODE_RE.split sem o preâmbulo, mas fatia um bloco por
+    vez em vez de montar a lista inteira de pedaços.
+    """
+    prev = None
+    for m in _SPLIT_CODE_RE.finditer(text):
+        if prev is not None:
+            yield prev.group(1), text[prev.end():m.start()]
+        prev = m
+    if prev is not None:
+        yield prev.group(1), text[prev.end():]
+
+
+def parse_pdf_text(pdf_path: str, digest: Optional[str] = None) -> List[Dict[str, str]]:
     """
     Extrai linhas relevantes do PDF. Ajuste conforme o layout real.
 
@@ -443,154 +904,114 @@ def parse_pdf_text(pdf_path: str) -> List[Dict[str, str]]:
       }
     Poderá retornar múltiplas entradas por ponto (histórico) dependendo do PDF.
     """
-    if pdfplumber is None:
-        # Sem pdfplumber, devolve vazio; usar stub ou instalar dependência
+    if pdfium is None and pdfplumber is None:
+        # Sem pypdfium2/pdfplumber, devolve vazio; usar stub ou instalar dependência
         return []
 
     results: List[Dict[str, str]] = []
-    with pdfplumber.open(pdf_path) as pdf:
-        text_pages: List[str] = []
-        for page in pdf.pages:
-            # Tenta primeiro com boa tolerância horizontal/vertical
-            page_text = page.extract_text(x_tolerance=1.5, y_tolerance=3) or ''
-            text_pages.append(page_text)
-        text = '\n'.join(text_pages)
-
-    # Normalizações simples
-    norm = re.sub(r'\s+', ' ', text)
-    # Também manter uma versão com quebras de linha para parsing por blocos
+    text = load_pdf_text(pdf_path, digest=digest)
+
+    # Texto com quebras de linha para parsing por blocos
     text_nl = text
 
     # Tentar capturar período do laudo (data mais recente)
     # Ex.: "período de 21/07/2025 a 21/08/2025"
-    m = re.search(r'período de (\d{2}/\d{2}/\d{4}) a (\d{2}/\d{2}/\d{4})', norm, re.IGNORECASE)
+    m = _PERIOD_RE.search(text_nl)
     laudo_to = None
     if m:
         laudo_to = m.group(2)
 
-    def strip_accents(txt: str) -> str:
-        return ''.join(c for c in unicodedata.normalize('NFD', txt) if unicodedata.category(c) != 'Mn')
-
-    def normalize_status_text(s: Optional[str]) -> str:
-        raw = (s or '').upper().replace('"', '').replace("'", '').replace('`', '')
-        ascii_ = strip_accents(raw)
-        if 'IMPROPRIO' in ascii_:
-            return 'IMPRÓPRIO'
-        if 'PROPRIO' in ascii_:
-            return 'PRÓPRIO'
-        return raw or 'DESCONHECIDO'
-
-    # Heurística 1 (por blocos): separar por códigos Pxx e buscar campos por linha
-    split_codes = re.split(r'(P\d{1,3})', text_nl)
-    if len(split_codes) > 1:
-        it = iter(split_codes)
-        preamble = next(it, '')  # texto antes do primeiro código (ignorado)
-        for code in it:
-            chunk = next(it, '')
-            code_up = code.strip().upper()
-            # Delimitar o bloco até o próximo código (já segmentado pelo split)
-            block = chunk.strip()
-            if not block:
-                continue
-            # Capturar campos principais em modo linha
-            def find_line(pats: List[str]) -> Optional[str]:
-                for pat in pats:
-                    m = re.search(pat, block, re.IGNORECASE)
-                    if m:
-                        return m.group(1).strip(' :-')
-                return None
-
-            beach = find_line([
-                r'^\s*Praia\s*:?\s*(.+)$',
-                r'\bPraia\s*:?\s*(.+)$',
-            ])
-
-            reference = find_line([
-                r'Ponto\s+de\s+refer(?:ê|e)ncia\s*:?\s*(.+)$',
-                r'Refer[eê]ncia\s*:?\s*(.+)$',
-                r'Ref\.?\s*:?\s*(.+)$',
-            ])
-
-            date = find_line([r'Data\s+da\s+coleta\s*:?\s*(\d{2}/\d{2}/\d{4})']) or laudo_to or ''
-
-            status_m = re.search(r'\b(IMPR[ÓO]PRIO|PR[ÓO]PRIO|IMPROPRIO|PROPRIO|IMPRPRIO)\b', block, re.IGNORECASE)
-            status = normalize_status_text(status_m.group(1) if status_m else None)
-
-            if status:
-                results.append({
-                    'code': code_up,
-                    'beach': beach or '',
-                    'reference': reference or '',
-                    'status': status,
-                    'date': date or ''
-                })
+    # Laudos sem o cabeçalho da série histórica pulam a busca de pares data-status
+    has_history = _HIST_HEADER_RE.search(text_nl) is not None
+    history: List[Dict[str, str]] = []
+    seen_history = set()
+
+    # Passada única pelos blocos Pxx: campos por linha (Heurística 1); se faltar
+    # status/praia, os padrões lineares (Heurística 2) rodam só sobre o bloco;
+    # a série histórica (Heurística 3) também é buscada dentro do bloco
+    for code, chunk in _iter_code_blocks(text_nl):
+        code_up = code.strip().upper()
+        block = chunk.strip()
+        if not block:
+            continue
+        # Capturar campos principais em modo linha
+        beach = _find_line(_PRAIA_RES, block) or ''
+        reference = _find_line(_REF_RES, block) or ''
+        block_date = _find_line(_DATA_RES, block)
+        date = block_date or laudo_to or ''
+        status_m = _STATUS_RE.search(block)
+        status = _normalize_status(status_m.group(1) if status_m else None)
+
+        if status not in _CANONICAL_STATUSES or not beach:
+            # Bloco com espaços colapsados: "Pxx Praia: X Ponto de referência: Y ... Status: W"
+            flat = code_up + ' ' + _WS_RE.sub(' ', block)
+            bm = _H2_RE.match(flat)
+            if bm:
+                # Grupos 2..5 de cada variante: praia, referência, data, status
+                base = _H2_OFFSETS[bm.lastgroup]
+                fb_beach, fb_ref, fb_date, fb_status = bm.group(base + 2, base + 3, base + 4, base + 5)
+                beach = beach or (fb_beach or '').strip(' :-')
+                reference = reference or (fb_ref or '').strip(' :-')
+                if not block_date and fb_date:
+                    date = fb_date
+                if status not in _CANONICAL_STATUSES:
+                    status = _normalize_status(fb_status)
+
+        results.append({
+            'code': code_up,
+            'beach': beach,
+            'reference': reference,
+            'status': status,
+            'date': date
+        })
 
-    # Heurística 2: blocos no texto linear "Praia: X Ponto de referência: Y Data: Z Status: W"
-    block_pat = re.compile(
-        r'(P\d{1,3})[^P]*?Praia:\s*(.*?)\s*(?:Ponto\s+de\s+refer(?:ê|e)ncia|Ponto\s+de\s+referencia|Refer[eê]ncia|Ref\.):\s*(.*?)\s*(?:Data\s+da\s+coleta:)?\s*(\d{2}/\d{2}/\d{4})?[^S]*?Status:\s*([A-ZÇÃÓÍÉÊÀÂÕÚ]+)',
-        re.IGNORECASE
-    )
-
-    for match in block_pat.finditer(norm):
-        code = match.group(1).upper()
-        beach = (match.group(2) or '').strip(' :-')
-        reference = (match.group(3) or '').strip(' :-')
-        date = match.group(4) or laudo_to or ''
-        status = normalize_status_text(match.group(5))
-        if code and status:
-            results.append({
-                'code': code,
-                'beach': beach,
-                'reference': reference,
-                'status': status,
-                'date': date
-            })
-
-    # Heurística 2 (fallback): tentar tabelas no texto contendo "Pxx" e status
-    if not results:
-        # Fallback genérico: linhas compactas com código, praia, referência e status
-        row_pat = re.compile(r'(P\d{1,3}).{0,80}?([A-Za-zÀ-ÿ\'\- ]+).{0,200}?\b(?:Ponto\s+de\s+refer(?:ê|e)ncia|Refer[eê]ncia|Ref\.)\s*:?\s*([^\n\r]+?)\s+(?:Data\s+da\s+coleta\s*:?\s*(\d{2}/\d{2}/\d{4}))?.{0,80}?\b(PR[ÓO]PRIO|IMPR[ÓO]PRIO)\b', re.IGNORECASE)
-        for m2 in row_pat.finditer(norm):
-            code = m2.group(1).upper()
-            beach = (m2.group(2) or '').strip()
-            reference = (m2.group(3) or '').strip()
-            date = (m2.group(4) or '') or laudo_to or ''
-            status = normalize_status_text(m2.group(5))
-            results.append({
-                'code': code,
-                'beach': beach,
-                'reference': reference,
-                'status': status,
-                'date': date
-            })
-
-    # Heurística 3: tentar capturar "Série histórica" próxima do bloco
-    # Busca até 300 caracteres após cada match por pares data-status
-    hist_pair = re.compile(r'(\d{2}/\d{2}/\d{4})\s*[-–—]\s*(PR[ÓO]PRIO|IMPR[ÓO]PRIO)', re.IGNORECASE)
-    if results:
-        # Revarre o texto original por janelas com base no código do ponto
-        for i, item in enumerate(results):
-            code = item['code']
-            mcode = re.search(re.escape(code), norm)
-            if not mcode:
-                continue
-            start = mcode.end()
-            window = norm[start:start+300]
-            for h in hist_pair.finditer(window):
-                d = parse_date_br(h.group(1))
-                s = normalize_status_text(h.group(2))
+        # Pares data-status até 300 caracteres após o código (1ª ocorrência do ponto)
+        if has_history and code_up not in seen_history:
+            seen_history.add(code_up)
+            for h in _HIST_PAIR.finditer(chunk, 0, 300):
                 # Insere como linhas extras; a consolidação agrupa por ponto
-                results.append({
-                    'code': code,
-                    'beach': item.get('beach') or '',
-                    'reference': item.get('reference') or '',
-                    'status': s,
-                    'date': d
+                history.append({
+                    'code': code_up,
+                    'beach': beach,
+                    'reference': reference,
+                    'status': _normalize_status(h.group(2)),
+                    'date': parse_date_br(h.group(1))
                 })
+    results.extend(history)
 
     return results
 
 
+def load_pdf_rows(pdf_path: str) -> List[Dict[str, str]]:
+    """parse_pdf_text com cache das linhas em data/raw/.cache/.
+
+    Laudos já vistos não mudam entre execuções; a chave combina o hash do
+    conteúdo, o extrator de texto e PARSER_VERSION.
+    """
+    if pdfium is None and pdfplumber is None:
+        # Sem extrator o resultado vazio não vale para o laudo: não lê nem grava cache
+        return parse_pdf_text(pdf_path)
+    digest = _file_sha1(pdf_path)
+    cache_path = os.path.join(CACHE_DIR, f'{digest}.{_text_engine()}.t{TEXT_CACHE_VERSION}.v{PARSER_VERSION}.rows.json')
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                data = f.read()
+            # orjson.JSONDecodeError herda de ValueError
+            return orjson.loads(data) if orjson is not None else json.loads(data)
+        except (OSError, ValueError):
+            pass  # cache corrompido: parseia de novo
+    rows = parse_pdf_text(pdf_path, digest=digest)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    if orjson is not None:
+        data = orjson.dumps(rows)
+    else:
+        data = json.dumps(rows, ensure_ascii=False).encode('utf-8')
+    with open(cache_path, 'wb') as f:
+        f.write(data)
+    return rows
+
+
 def parse_date_br(s: str) -> str:
     try:
         return datetime.strptime(s, '%d/%m/%Y').strftime('%Y-%m-%d')
@@ -602,16 +1023,17 @@ def load_geocodes(path: str) -> Dict[str, Dict[str, str]]:
     geos: Dict[str, Dict[str, str]] = {}
     if not os.path.exists(path):
         return geos
-    with open(path, 'r', encoding='utf-8') as f:
-        header = f.readline()
-        for line in f:
-            if not line.strip():
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        next(reader, None)  # cabeçalho
+        for row in reader:
+            if not row:
+                continue
+            # 6 colunas no máximo; o csv já trata vírgulas e aspas dentro dos campos
+            code, beach, reference, city, lat, lng = [p.strip() for p in (row + [''] * 6)[:6]]
+            if not code:
                 continue
-            # Divide em 6 colunas no máximo, preservando vírgulas dentro de aspas
-            parts = re.split(r',(?=(?:[^"]*"[^"]*")*[^"]*$)', line.strip())
-            parts = [p.strip().strip('"') for p in parts]
-            code, beach, reference, city, lat, lng = (parts + ['',''])[:6]
-            geos[code.strip().upper()] = {
+            geos[code.upper()] = {
                 'beach': beach,
                 'reference': reference,
                 'city': city,
@@ -631,23 +1053,12 @@ def consolidate(stations_raw: List[Dict[str, str]], source_url: str) -> Dict[str
         s.beach = s.beach or row.get('beach')
         s.reference = s.reference or row.get('reference')
         date_iso = parse_date_br(row.get('date', ''))
-        # Normaliza status ainda na consolidação para garantir canônico
-        status = (row.get('status') or '')
-        # Reusa mesma lógica de normalização do parser
-        try:
-            import unicodedata as _u
-            def _strip(t):
-                return ''.join(c for c in _u.normalize('NFD', t) if _u.category(c) != 'Mn')
-            raw = status.upper().replace('"','').replace("'",'').replace('`','')
-            ascii_ = _strip(raw)
-            if 'IMPROPRIO' in ascii_:
-                status = 'IMPRÓPRIO'
-            elif 'PROPRIO' in ascii_:
-                status = 'PRÓPRIO'
-        except Exception:
-            status = status.upper()
+        # parse_pdf_text já emite o status canônico; só renormaliza o que vier diferente
+        status = row.get('status') or ''
+        if status and status not in _CANONICAL_STATUSES:
+            status = _normalize_status(status)
         if date_iso and status:
-            s.history.append(Sample(date=date_iso, status=status))
+            s.history.add((date_iso, status))
         s.source_laudo = s.source_laudo or source_url
         agg[code] = s
     return agg
@@ -675,7 +1086,9 @@ def attach_geocodes(agg: Dict[str, Station], geos: Dict[str, Dict[str, str]]):
 def to_points_json(agg: Dict[str, Station]) -> List[Dict[str, object]]:
     out: List[Dict[str, object]] = []
     for s in agg.values():
-        hist_sorted = sorted({(h.date, h.status) for h in s.history}, key=lambda x: x[0])
+        # Sem duplicatas já na coleta; ordena por data e, em conflito na mesma data,
+        # IMPRÓPRIO fica por último e prevalece como status atual (lado da cautela)
+        hist_sorted = sorted(s.history, key=lambda t: (t[0], t[1] == 'IMPRÓPRIO', t[1]))
         latest = hist_sorted[-1] if hist_sorted else None
         out.append({
             'code': s.code,
@@ -693,29 +1106,57 @@ def to_points_json(agg: Dict[str, Station]) -> List[Dict[str, object]]:
     return out
 
 
+# "latest": {"date": "AAAA-MM-DD" ...} — o histórico usa outra chave e não casa
+_LATEST_DATE_RE = re.compile(rb'"latest"\s*:\s*\{\s*"date"\s*:\s*"(\d{4}-\d{2}-\d{2})"')
+
+
+def max_latest_date(path: str) -> Optional[str]:
+    """Data mais recente (latest.date) de um points.json, sem desserializar o arquivo."""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    dates = _LATEST_DATE_RE.findall(data)
+    return max(dates).decode('ascii') if dates else None
+
+
+def write_points_json(points: List[Dict[str, object]], path: str, pretty: bool = False):
+    """Grava points.json; compacto por padrão, indentado com pretty=True."""
+    # orjson (C) serializa direto em bytes UTF-8; json da stdlib como fallback
+    if orjson is not None:
+        data = orjson.dumps(points, option=orjson.OPT_INDENT_2 if pretty else 0)
+    elif pretty:
+        data = json.dumps(points, ensure_ascii=False, indent=2).encode('utf-8')
+    else:
+        data = json.dumps(points, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
 def write_stations_index_csv(agg: Dict[str, Station], path: str):
     # Gera um índice para facilitar preenchimento de coordenadas oficiais
+    # csv.writer escapa aspas/vírgulas corretamente (antes '"' virava "'")
     with open(path, 'w', encoding='utf-8', newline='') as f:
-        f.write('code,beach,reference,city,lat,lng\n')
-        for s in sorted(agg.values(), key=lambda x: x.code):
-            lat = '' if s.lat is None else str(s.lat)
-            lng = '' if s.lng is None else str(s.lng)
-            b = (s.beach or '').replace('"', "'")
-            r = (s.reference or '').replace('"', "'")
-            c = (s.city or '').replace('"', "'")
-            f.write(f'{s.code},"{b}","{r}","{c}",{lat},{lng}\n')
+        w = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
+        w.writerow(['code', 'beach', 'reference', 'city', 'lat', 'lng'])
+        w.writerows([
+            (s.code, s.beach or '', s.reference or '', s.city or '',
+             '' if s.lat is None else s.lat, '' if s.lng is None else s.lng)
+            for s in sorted(agg.values(), key=lambda x: x.code)
+        ])
 
 
-def run(limit: int = 3, timeout: int = 120, from_file: Optional[str] = None, web_source_url: Optional[str] = None, refresh_raw: bool = False, insecure: Optional[bool] = None):
+def run(limit: int = 3, timeout: int = 120, from_file: Optional[str] = None, web_source_url: Optional[str] = None, refresh_raw: bool = False, insecure: Optional[bool] = None, pretty: bool = False, http2: bool = False):
     ensure_dirs()
+    # Define inseguro via CLI ou variável de ambiente
+    insecure_flag = _insecure_ssl() if insecure is None else insecure
     items: List[Dict[str, str]] = []
     if from_file:
         # Usa um PDF local em vez de baixar
         items = [{'title': os.path.basename(from_file), 'url': f'file://{from_file}'}]
     else:
-        # Define inseguro via CLI ou variável de ambiente
-        insecure_flag = _insecure_ssl() if insecure is None else insecure
-        items = fetch_laudo_index(limit=limit, timeout=timeout, insecure=insecure_flag)
+        items = fetch_laudo_index(limit=limit, timeout=timeout, insecure=insecure_flag, session=SESSION)
 
         # FALLBACK: Se o índice falhou, tenta URLs diretas baseadas em datas recentes
         if not items:
@@ -723,40 +1164,73 @@ def run(limit: int = 3, timeout: int = 120, from_file: Optional[str] = None, web
             candidate_urls = generate_recent_pdf_urls(weeks_back=8)
             items = candidate_urls[:limit * 2]  # Tenta mais URLs para compensar possíveis 404s
     all_rows: List[Dict[str, str]] = []
-    for idx, it in enumerate(items):
-        # Adiciona delay entre requisições para parecer mais humano (exceto primeira)
-        if idx > 0:
-            delay = 2.0  # 2 segundos entre cada PDF
-            print(f'Aguardando {delay}s antes da próxima requisição...')
-            time.sleep(delay)
-
+    remote_urls: List[str] = []
+    for it in items:
         url = it['url']
         if url.startswith('file://'):
             pdf_path = url.replace('file://', '')
-            rows = parse_pdf_text(pdf_path)
+            rows = load_pdf_rows(pdf_path)
             for r in rows:
                 r['source_url'] = web_source_url or url
             all_rows.extend(rows)
             continue
-        if not url.lower().endswith('.pdf'):
-            # Alguns laudos são páginas; tenta localizar PDF dentro da página
-            resolved = resolve_pdf_from_page(url, timeout=timeout, insecure=insecure_flag)
-            if not resolved:
-                # Sem PDF interno, pula
-                print(f'INFO: sem PDF encontrado na página {url} — ignorando')
-                continue
-            url = resolved
-            # Delay adicional após resolver a página
-            time.sleep(1.0)
+        remote_urls.append(url)
+
+    def _resolve(url: str) -> Optional[str]:
+        if url.lower().endswith('.pdf'):
+            return url
+        # Alguns laudos são páginas; tenta localizar PDF dentro da página
+        resolved = resolve_pdf_from_page(url, timeout=timeout, insecure=insecure_flag, session=SESSION)
+        if not resolved:
+            # Sem PDF interno, pula
+            print(f'INFO: sem PDF encontrado na página {url} — ignorando')
+        return resolved
+
+    # Páginas resolvidas em paralelo; a ordem dos itens é preservada
+    pdf_urls: List[str] = []
+    if remote_urls:
+        with ThreadPoolExecutor(max_workers=min(DOWNLOAD_WORKERS, len(remote_urls))) as ex:
+            resolved_urls = list(ex.map(_resolve, remote_urls))
+        for url in resolved_urls:
+            if url and url not in pdf_urls:
+                pdf_urls.append(url)
+
+    client = make_http2_client(insecure=insecure_flag) if (http2 and pdf_urls) else None
+
+    def _download(url: str) -> str:
         try:
-            pdf_path = download_pdf(url, timeout=timeout, force=refresh_raw, insecure=insecure_flag)
-            # Se download_pdf retornar string vazia, significa que o PDF não existe (404)
-            if not pdf_path:
-                continue
-            rows = parse_pdf_text(pdf_path)
-        except requests.RequestException as e:
+            return download_pdf(url, timeout=timeout, force=refresh_raw, insecure=insecure_flag, session=SESSION, client=client)
+        except NET_ERRORS as e:
             print(f'WARN: falha ao baixar PDF {url}: {e}')
+        except Exception as e:
+            print(f'WARN: erro ao salvar PDF {url}: {e}')
+            traceback.print_exc()
+        return ''
+
+    # URLs de diretórios diferentes podem cair no mesmo arquivo local: só a primeira
+    # de cada destino é baixada (duas threads não escrevem no mesmo caminho) e as
+    # demais reaproveitam o resultado, como no laço serial antigo
+    download_urls: Dict[str, str] = {}
+    for url in pdf_urls:
+        download_urls.setdefault(local_pdf_path(url), url)
+
+    # Downloads em paralelo (limitados pela rede); o parse segue em ordem na thread principal
+    pdf_paths: List[str] = []
+    if pdf_urls:
+        try:
+            with ThreadPoolExecutor(max_workers=min(DOWNLOAD_WORKERS, len(download_urls))) as ex:
+                by_target = dict(zip(download_urls, ex.map(_download, download_urls.values())))
+        finally:
+            if client is not None:
+                client.close()
+        pdf_paths = [by_target[local_pdf_path(url)] for url in pdf_urls]
+
+    for url, pdf_path in zip(pdf_urls, pdf_paths):
+        # String vazia indica PDF inexistente (404) ou falha no download
+        if not pdf_path:
             continue
+        try:
+            rows = load_pdf_rows(pdf_path)
         except Exception as e:
             print(f'WARN: erro ao processar PDF {url}: {e}')
             traceback.print_exc()
@@ -788,21 +1262,6 @@ def run(limit: int = 3, timeout: int = 120, from_file: Optional[str] = None, web
     attach_geocodes(agg, geos)
 
     # Emite JSON
-    def _max_date_from_points(path: str) -> Optional[str]:
-        try:
-            if not os.path.exists(path):
-                return None
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            dates = []
-            for p in data:
-                d = (p.get('latest') or {}).get('date')
-                if d:
-                    dates.append(d)
-            return max(dates) if dates else None
-        except Exception:
-            return None
-
     if agg:
         points = to_points_json(agg)
         # Mantém log informativo, mas sempre escreve para refletir mudanças de conteúdo
@@ -814,11 +1273,10 @@ def run(limit: int = 3, timeout: int = 120, from_file: Optional[str] = None, web
         except Exception:
             pass
 
-        cur_latest = _max_date_from_points(POINTS_JSON)
+        cur_latest = max_latest_date(POINTS_JSON)
         print(f"Comparação de versões (informativo): atual={cur_latest} novo={new_latest}")
 
-        with open(POINTS_JSON, 'w', encoding='utf-8') as f:
-            json.dump(points, f, ensure_ascii=False, indent=2)
+        write_points_json(points, POINTS_JSON, pretty=pretty)
         print(f'Gerado: {POINTS_JSON} (itens={len(points)})')
     else:
         print('Sem pontos consolidados – mantendo points.json atual (se existir).')
@@ -837,6 +1295,8 @@ if __name__ == '__main__':
     parser.add_argument('--web-source-url', type=str, default=None, help='URL pública do laudo (para Fonte: SEMA/MA)')
     parser.add_argument('--refresh-raw', action='store_true', help='Força re-download dos PDFs em data/raw/')
     parser.add_argument('--insecure', action='store_true', default=None, help='Ignora verificação SSL (apenas testes locais)')
+    parser.add_argument('--pretty', action='store_true', help='Grava points.json indentado (padrão: compacto)')
+    parser.add_argument('--http2', action='store_true', help='Baixa os PDFs via HTTP/2 multiplexado (requer httpx[http2])')
     args = parser.parse_args()
-    run(limit=args.limit, timeout=args.timeout, from_file=args.from_file, web_source_url=args.web_source_url, refresh_raw=args.refresh_raw, insecure=args.insecure)
+    run(limit=args.limit, timeout=args.timeout, from_file=args.from_file, web_source_url=args.web_source_url, refresh_raw=args.refresh_raw, insecure=args.insecure, pretty=args.pretty, http2=args.http2)
 
@@ -22,33 +22,46 @@ DATA_DIR = os.path.join(ROOT, 'data')
 GEOCODES_CSV = os.path.join(DATA_DIR, 'stations_geocoded.csv')
 
 
+FIELDS = ('code', 'beach', 'reference', 'city', 'lat', 'lng')
+
+
 def read_csv_map(path: str) -> Dict[str, Dict[str, Any]]:
     out: Dict[str, Dict[str, Any]] = {}
     if not os.path.exists(path):
         return out
-    with open(path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        # csv.reader + índice das colunas evita um dict por linha do DictReader
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return out
+        idx = {name: i for i, name in enumerate(header)}
+        if 'code' not in idx:
+            return out
+        cols = [(name, idx.get(name)) for name in FIELDS[1:]]
+        i_code = idx['code']
         for row in reader:
-            code = (row.get('code') or '').strip().upper()
+            if not row:
+                continue
+            n = len(row)
+            code = (row[i_code] if i_code < n else '').strip().upper()
             if not code:
                 continue
-            out[code] = {
-                'code': code,
-                'beach': row.get('beach') or '',
-                'reference': row.get('reference') or '',
-                'city': row.get('city') or '',
-                'lat': row.get('lat') or '',
-                'lng': row.get('lng') or '',
-            }
+            rec: Dict[str, Any] = {'code': code}
+            for name, i in cols:
+                rec[name] = row[i] if i is not None and i < n else ''
+            out[code] = rec
     return out
 
 
 def write_csv_map(path: str, data: Dict[str, Dict[str, Any]]):
     with open(path, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=['code', 'beach', 'reference', 'city', 'lat', 'lng'])
-        writer.writeheader()
-        for code in sorted(data.keys()):
-            writer.writerow(data[code])
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        writer.writerows(
+            [data[code].get(name, '') for name in FIELDS]
+            for code in sorted(data.keys())
+        )
 
 
 def main(src: str):
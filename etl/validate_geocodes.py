@@ -2,51 +2,123 @@
 Valida cobertura de coordenadas vs. pontos detectados.
 
 Uso (após gerar stations_index.csv):
-  python etl/validate_geocodes.py
+  python etl/validate_geocodes.py [--limit 10] [--quick]
 """
 
+import argparse
 import csv
 import os
+import sys
+from operator import itemgetter
 
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 DATA_DIR = os.path.join(ROOT, 'data')
 INDEX_CSV = os.path.join(DATA_DIR, 'stations_index.csv')
 GEOCODES_CSV = os.path.join(DATA_DIR, 'stations_geocoded.csv')
+# Buffer de leitura maior: menos chamadas read() ao varrer os CSVs
+READ_BUFFER = 1 << 20
 
 
-def read_csv_codes(path):
-    if not os.path.exists(path):
-        return {}
-    out = {}
-    with open(path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+def _header_index(reader):
+    """Lê o cabeçalho e devolve {nome da coluna: posição}."""
+    header = next(reader, None) or []
+    return {name: i for i, name in enumerate(header)}
+
+
+def _cell(row, i):
+    return row[i] if i is not None and i < len(row) else ''
+
+
+def _row_fields(idx, names):
+    """Monta, a partir do cabeçalho, um extrator especializado das colunas `names`.
+
+    No caso comum (todas as colunas presentes e linha completa) é um único
+    itemgetter em C; colunas ausentes ou linhas curtas caem em _cell ('').
+    """
+    cols = [idx.get(name) for name in names]
+    if None in cols:
+        return lambda row: tuple(_cell(row, i) for i in cols)
+    get = itemgetter(*cols)
+    width = max(cols) + 1
+    return lambda row: get(row) if len(row) >= width else tuple(_cell(row, i) for i in cols)
+
+
+def read_geo_have_coords(path):
+    """Códigos com lat e lng preenchidos (vale a última linha de cada código)."""
+    have = set()
+    try:
+        f = open(path, 'r', encoding='utf-8', newline='', buffering=READ_BUFFER)
+    except FileNotFoundError:
+        return have
+    with f:
+        reader = csv.reader(f)
+        idx = _header_index(reader)
+        if 'code' not in idx:
+            return have
+        fields = _row_fields(idx, ('code', 'lat', 'lng'))
         for row in reader:
-            code = (row.get('code') or '').strip().upper()
+            code, lat, lng = fields(row)
+            # Internado: o mesmo objeto é reaproveitado pelo set e pelas buscas do índice
+            code = sys.intern(code.strip().upper())
             if not code:
                 continue
-            out[code] = row
-    return out
+            # Espaços não contam como coordenada (load_geocodes também faz strip)
+            if lat.strip() and lng.strip():
+                have.add(code)
+            else:
+                have.discard(code)
+    return have
 
 
-def main():
-    idx = read_csv_codes(INDEX_CSV)
-    geo = read_csv_codes(GEOCODES_CSV)
-    if not idx:
+def main(limit: int = 10, quick: bool = False):
+    try:
+        f = open(INDEX_CSV, 'r', encoding='utf-8', newline='', buffering=READ_BUFFER)
+    except FileNotFoundError:
         print('Gere primeiro data/stations_index.csv via etl/fetch_sema.py')
         return
-    missing = []
-    for code, row in idx.items():
-        g = geo.get(code)
-        if not g or not (g.get('lat') and g.get('lng')):
-            missing.append((code, row.get('beach') or '', row.get('reference') or ''))
-    print(f'Total pontos detectados: {len(idx)}')
+    # Uma passada pelo índice: só os primeiros `limit` pontos sem coordenadas
+    # guardam praia/referência; os demais entram apenas na contagem
+    seen = set()
+    missing = set()
+    examples = {}
+    stopped = False
+    with f:
+        have_coords = read_geo_have_coords(GEOCODES_CSV)
+        reader = csv.reader(f)
+        idx = _header_index(reader)
+        if 'code' in idx:
+            fields = _row_fields(idx, ('code', 'beach', 'reference'))
+            for row in reader:
+                code, beach, ref = fields(row)
+                code = sys.intern(code.strip().upper())
+                if not code:
+                    continue
+                seen.add(code)
+                if code in have_coords:
+                    continue
+                missing.add(code)
+                if code in examples or len(examples) < limit:
+                    examples[code] = (beach, ref)
+                elif quick:
+                    # Só os exemplos interessam: para sem ler o resto do índice
+                    stopped = True
+                    break
+    if not seen:
+        print('Gere primeiro data/stations_index.csv via etl/fetch_sema.py')
+        return
+    if stopped:
+        print(f'Modo rápido: leitura interrompida após {limit} exemplos (contagens parciais)')
+    print(f'Total pontos detectados: {len(seen)}')
     print(f'Faltam coordenadas: {len(missing)}')
-    if missing:
+    if examples:
         print('Exemplos ausentes:')
-        for code, beach, ref in missing[:10]:
+        for code, (beach, ref) in examples.items():
             print(f' - {code} | {beach} | {ref}')
 
 
 if __name__ == '__main__':
-    main()
-
+    parser = argparse.ArgumentParser(description='Validar cobertura de coordenadas dos pontos detectados')
+    parser.add_argument('--limit', type=int, default=10, help='Quantidade de exemplos ausentes a listar')
+    parser.add_argument('--quick', action='store_true', help='Para ao reunir --limit exemplos (contagens parciais)')
+    args = parser.parse_args()
+    main(limit=args.limit, quick=args.quick)